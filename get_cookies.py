@@ -8,12 +8,12 @@ session cookies to a JSON file for use with the web scraper.
 Author: Jason Bisnette
 License: MIT
 """
-# Import json for writing cookies to file
-import json
 # Import argparse for command-line argument parsing
 import argparse
 # Import Playwright synchronous API for browser automation
 from playwright.sync_api import sync_playwright
+# Import the scraper's cookie writer so both tools share one file format
+from scraper import save_cookies
 
 # Create an argument parser for command-line arguments
 ap = argparse.ArgumentParser()
@@ -44,10 +44,8 @@ with sync_playwright() as p:
     # Extract all cookies from the browser context (includes session auth cookies)
     cookies = context.cookies()
 
-# Open the output file for writing cookies as JSON
-with open(args.output, 'w') as f:
-    # Write the cookies list to the file in formatted JSON (with indentation for readability)
-    json.dump(cookies, f, indent=2)
+# Write the cookies list to the output file as JSON
+save_cookies(cookies, args.output)
 
 # Print confirmation message with the number of cookies saved
 print(f"Saved {len(cookies)} cookies to {args.output}")
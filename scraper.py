@@ -13,22 +13,137 @@ License: MIT
 import argparse
 # Import time for sleep delays between requests
 import time
+# Import random for jitter on the delay between requests
+import random
 # Import json for parsing cookies from file
 import json
+# Use orjson for faster cookie file handling when it is installed (optional dependency)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 # Import requests library for HTTP requests
 import requests
+# Import HTTPAdapter to configure connection pooling on the shared session
+from requests.adapters import HTTPAdapter
+# Import requests' charset detector (chardet or charset_normalizer, may be None)
+from requests.compat import chardet
+# Import Retry to configure automatic retries with backoff
+from urllib3.util.retry import Retry
 # Import URL parsing utilities
 from urllib.parse import urljoin, urlparse
 # Import BeautifulSoup for HTML parsing
 from bs4 import BeautifulSoup
-# Import markdownify to convert HTML to Markdown
-from markdownify import markdownify as md
+# Import soupsieve (BeautifulSoup's CSS engine) to compile selectors once at import time
+import soupsieve
+# Import lxml directly for lightweight link extraction without a bs4 tree
+from lxml import etree, html as lxml_html
+# Import markdownify's converter to turn parsed HTML into Markdown
+from markdownify import MarkdownConverter
 # Import os for file and directory operations
 import os
+# Import re for precompiled link-filter patterns
+import re
+# Import hashlib to derive cache file names from URLs
+import hashlib
+# Import tempfile for atomic cache writes
+import tempfile
+# Import lru_cache to memoize URL parsing for links that repeat across pages
+from functools import lru_cache
+# Import deque for an O(1) FIFO crawl queue
+from collections import deque
+# Import ThreadPoolExecutor for fetching several pages concurrently
+from concurrent.futures import ThreadPoolExecutor
+# Import ProcessPoolExecutor for converting pages to Markdown on multiple cores
+from concurrent.futures import ProcessPoolExecutor
+# Import multiprocessing to choose how Markdown worker processes are started
+import multiprocessing
+# Import threading for the lock shared by rate-limited fetch threads
+import threading
+# Import contextmanager to manage the lifetime of a crawl's shared browser
+from contextlib import contextmanager
 
 # Define User-Agent header to identify the scraper to web servers
 HEADERS = {"User-Agent": "WebScraper/1.0 (+https://github.com/Yeddo)"}
 
+# Longest pause, in seconds, taken when the server asks us to wait (Retry-After or rate-limit headers)
+MAX_RATE_LIMIT_WAIT = 60
+
+
+class CappedRetry(Retry):
+    """
+    urllib3 Retry policy that honours Retry-After, but never waits longer than MAX_RATE_LIMIT_WAIT.
+    """
+    
+    def get_retry_after(self, response):
+        # Read the server's requested wait, then clamp it like the X-RateLimit-Reset pause
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_RATE_LIMIT_WAIT)
+
+
+# Create a shared session so repeated requests to the same host reuse connections
+SESSION = requests.Session()
+# Configure the connection pool size and retry policy: exponential backoff on
+# connection errors and 429/5xx responses, waiting as long as Retry-After asks (up to a cap)
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=CappedRetry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        allowed_methods=["GET"],
+    ),
+)
+# Mount the adapter for both HTTPS and HTTP URLs
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
+
+# Content types treated as HTML pages; anything else is skipped without being downloaded
+HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml"}
+# Largest response body, in bytes, that will be read and parsed
+MAX_PAGE_BYTES = 10 * 1024 * 1024
+
+# CSS selectors for common documentation/article containers
+# Ordered by specificity and likelihood of containing the main article content
+MAIN_CONTENT_SELECTORS = ("main", "article", "div.doc-content", "div.content", "div#content", "div.article-body")
+# Each selector compiled on its own, used to rank candidates by priority
+MAIN_CONTENT_PATTERNS = [soupsieve.compile(sel) for sel in MAIN_CONTENT_SELECTORS]
+# All selectors as one compiled union, so candidates are found in a single tree walk
+MAIN_CONTENT_MATCHER = soupsieve.compile(", ".join(MAIN_CONTENT_SELECTORS))
+# Elements inside the content area that never contribute useful Markdown
+NOISE_PATTERN = soupsieve.compile("script, style, noscript, svg, iframe")
+# Page chrome pruned only inside a matched container; some sites wrap the whole body in a <form>
+CHROME_PATTERN = soupsieve.compile("form, nav, footer")
+# Elements Playwright waits for before capturing a page (any of the main content containers)
+WAIT_SELECTOR = ", ".join(MAIN_CONTENT_SELECTORS)
+# Playwright resource types that are aborted instead of downloaded
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# Seconds a cached page is served without asking the server again (one day)
+CACHE_MAX_AGE = 24 * 60 * 60
+
+# Markdown converter using ATX-style (#) headings, created once per process
+MARKDOWN = MarkdownConverter(heading_style="ATX")
+
+# Fraction of a batch's response time to wait before the next batch
+DELAY_RTT_FACTOR = 0.5
+
+# Time (from time.time()) before which no new request is sent, shared by all fetch threads
+_rate_limited_until = 0.0
+# Lock guarding _rate_limited_until across fetch threads
+_rate_limit_lock = threading.Lock()
+
+# Links to skip (authentication pages, login forms, etc.), matched case-insensitively in one scan
+SKIP_RE = re.compile(r"sign_in|login|logout|recover|reset|register", re.IGNORECASE)
+
+# Compiled XPath returning every anchor href as a plain string (no back-references to the tree)
+HREF_XPATH = etree.XPath("//a/@href", smart_strings=False)
+
+# Memoized urlparse; crawls see the same navigation links on nearly every page
+_parse_url = lru_cache(maxsize=8192)(urlparse)
+
 
 def same_domain(a, b):
     """
@@ -42,7 +157,7 @@ def same_domain(a, b):
         bool: True if both URLs have the same netloc (domain)
     """
     # Extract netloc (domain + port) from both URLs and compare them
-    return urlparse(a).netloc == urlparse(b).netloc
+    return _parse_url(a).netloc == _parse_url(b).netloc
 
 
 def is_within_prefix(url, prefix):
@@ -57,15 +172,18 @@ def is_within_prefix(url, prefix):
         bool: True if the URL's path starts with the prefix path
     """
     # Extract the path component from the prefix URL
-    p = urlparse(prefix).path
+    p = _parse_url(prefix).path
     # Check if the target URL's path starts with the prefix path
-    return urlparse(url).path.startswith(p)
+    return _parse_url(url).path.startswith(p)
 
 
 def get_links(html, base_url):
     """
     Extract all links from HTML content, filtering out auth/nav fragments.
     
+    Parses with lxml.html directly since only the href attributes are needed,
+    falling back to BeautifulSoup for input lxml.html rejects.
+    
     Args:
         html (str): HTML content to parse
         base_url (str): Base URL for resolving relative links
@@ -73,22 +191,54 @@ def get_links(html, base_url):
     Returns:
         set: Set of absolute URLs found in the HTML
     """
-    # Parse the HTML using BeautifulSoup with the html.parser backend
-    soup = BeautifulSoup(html, "html.parser")
+    try:
+        # Parse the HTML into an lxml element tree (no bs4 Tag objects are created); str input
+        # is passed as UTF-8 bytes since lxml rejects strings with an XML encoding declaration
+        doc = lxml_html.fromstring(html.encode("utf-8"), parser=lxml_html.HTMLParser(encoding="utf-8"))
+    # Documents with no elements (empty, doctype or comment only) can't be parsed by lxml.html
+    except (etree.ParserError, ValueError):
+        # Let BeautifulSoup handle them, as it always has
+        return get_links_from_soup(BeautifulSoup(html, "lxml"), base_url)
+    # Pull every anchor href in one XPath pass and filter them
+    return filter_links(HREF_XPATH(doc), base_url)
+
+
+def get_links_from_soup(soup, base_url):
+    """
+    Extract all links from an already-parsed page, filtering out auth/nav fragments.
+    
+    Args:
+        soup (BeautifulSoup): Parsed HTML document
+        base_url (str): Base URL for resolving relative links
+        
+    Returns:
+        set: Set of absolute URLs found in the document
+    """
+    # Collect the href of every anchor (<a>) tag that has one, then filter them
+    return filter_links((a["href"] for a in soup.find_all("a", href=True)), base_url)
+
+
+def filter_links(hrefs, base_url):
+    """
+    Resolve raw href values to absolute URLs, dropping auth links and in-page anchors.
+    
+    Args:
+        hrefs (iterable): Raw href attribute values
+        base_url (str): Base URL for resolving relative links
+        
+    Returns:
+        set: Set of absolute URLs without fragment identifiers
+    """
     # Initialize empty set to store unique URLs (sets prevent duplicates)
     out = set()
-    # Define patterns for URLs to skip (authentication pages, login forms, etc.)
-    skip_patterns = ['sign_in', 'login', 'logout', 'recover', 'reset', 'register', '#']
     
-    # Find all anchor (<a>) tags in the HTML that have an href attribute
-    for a in soup.find_all("a", href=True):
-        # Extract the href value from the anchor tag
-        href = a["href"]
+    # Check each href value from the page
+    for href in hrefs:
         # Skip fragment-only links (anchors that navigate within the same page)
         if href.startswith("#"):
             continue
         # Skip any href that contains authentication-related patterns
-        if any(p in href.lower() for p in skip_patterns):
+        if SKIP_RE.search(href):
             continue
         # Convert relative URLs to absolute URLs using the base URL
         full = urljoin(base_url, href)
@@ -111,26 +261,306 @@ def extract_main_content(html):
     Returns:
         str: HTML string of the main content area
     """
-    # Parse the HTML using BeautifulSoup
-    soup = BeautifulSoup(html, "html.parser")
+    # Parse the HTML using BeautifulSoup with the lxml parser
+    soup = BeautifulSoup(html, "lxml")
+    # Delegate content extraction to the soup-based helper
+    return extract_main_content_from_soup(soup)
+
+
+def extract_main_content_from_soup(soup):
+    """
+    Extract main article content from an already-parsed page.
+    
+    Scripts, styles and other non-content elements are removed from the chosen
+    element in place (plus forms, navigation and footers when a content container
+    matched), so read links from the soup before calling this.
+    
+    Args:
+        soup (BeautifulSoup): Parsed HTML document
+        
+    Returns:
+        str: HTML string of the main content area
+    """
+    # Find every candidate container in a single walk of the document
+    hits = MAIN_CONTENT_MATCHER.select(soup)
+    # Pick by selector priority, not document order, so an outer div.content never wins
+    # over the <main> nested inside it; ties go to the earliest element in the document
+    if hits:
+        el = min(hits, key=_main_content_rank)
+        # Inside a real content container, forms, navigation and footers are page chrome
+        for tag in CHROME_PATTERN.select(el):
+            tag.decompose()
+    else:
+        # Fallback if no article container is found: use body or entire document, keeping
+        # forms etc. since they may wrap the whole page (e.g. ASP.NET WebForms)
+        el = soup.body or soup
+    
+    # Drop non-content subtrees so they are neither serialized nor converted to Markdown
+    for tag in NOISE_PATTERN.select(el):
+        tag.decompose()
+    # Return the HTML of the cleaned-up content area
+    return str(el)
+
+
+def _main_content_rank(el):
+    """
+    Rank a candidate content container by the first selector it matches.
+    
+    Args:
+        el (Tag): Element matched by MAIN_CONTENT_MATCHER
+        
+    Returns:
+        int: Index into MAIN_CONTENT_SELECTORS (lower is preferred)
+    """
+    # Return the position of the highest-priority selector matching this element
+    return next(i for i, pattern in enumerate(MAIN_CONTENT_PATTERNS) if pattern.match(el))
+
+
+def load_cookies(path):
+    """
+    Load cookies saved by get_cookies.py.
     
-    # List of CSS selectors for common documentation/article containers
-    # Ordered by specificity and likelihood of containing the main article content
-    selectors = ["main", "article", "div.doc-content", "div.content", "div#content", "div.article-body"]
+    Args:
+        path (str): Path to the cookies JSON file
+        
+    Returns:
+        list: Cookie dictionaries (Playwright format)
+    """
+    # Open the cookies JSON file for reading as raw bytes
+    with open(path, 'rb') as f:
+        # Parse with orjson when available, otherwise the standard library
+        return orjson.loads(f.read()) if orjson else json.load(f)
+
+
+def save_cookies(cookies, path):
+    """
+    Save cookies to a JSON file readable by load_cookies.
     
-    # Iterate through selectors to find the first matching element in order
-    for sel in selectors:
-        # Try to select an element using the current CSS selector
-        el = soup.select_one(sel)
-        # If an element matching the selector was found, return its HTML
-        if el:
-            return str(el)
+    Args:
+        cookies (list): Cookie dictionaries (Playwright format)
+        path (str): Path to the cookies JSON file
+    """
+    # orjson produces UTF-8 bytes, so write them as-is regardless of the locale's encoding
+    if orjson:
+        with open(path, 'wb') as f:
+            # Write the cookies list in formatted JSON (with indentation for readability)
+            f.write(orjson.dumps(cookies, option=orjson.OPT_INDENT_2))
+    else:
+        # Open the output file as UTF-8 text so it reads back the same under any locale
+        with open(path, 'w', encoding='utf-8') as f:
+            # Write the cookies list in formatted JSON (with indentation for readability)
+            json.dump(cookies, f, indent=2)
+
+
+def load_session_cookies(cookies):
+    """
+    Copy browser-exported cookies into the shared HTTP session.
     
-    # Fallback if no article container is found: return body or entire document
-    return str(soup.body or soup)
+    Args:
+        cookies (list): Cookie dictionaries as saved by get_cookies.py (Playwright format)
+    """
+    # Add each cookie to the session's jar, keeping its domain/path scope
+    for c in cookies:
+        # Playwright marks session cookies with an expiry of -1; requests expects None
+        expires = c.get("expires")
+        if expires is not None and expires < 0:
+            expires = None
+        # Register the cookie so it is sent on matching requests
+        SESSION.cookies.set(
+            c["name"],
+            c["value"],
+            domain=c.get("domain", ""),
+            path=c.get("path", "/"),
+            secure=c.get("secure", False),
+            expires=expires,
+        )
 
 
-def fetch(url, use_playwright=False, cookies=None, context=None):
+@contextmanager
+def launch_browser(enabled=True):
+    """
+    Launch a headless Chromium browser to be shared by a whole crawl.
+    
+    Args:
+        enabled (bool): Whether to launch a browser at all
+        
+    Yields:
+        object: Playwright Browser, or None if disabled or Playwright could not start
+    """
+    # Track the Playwright driver and browser so whatever started gets shut down
+    playwright = browser = None
+    # Only start Playwright when the crawl actually needs a browser
+    if enabled:
+        try:
+            # Import Playwright's synchronous API
+            from playwright.sync_api import sync_playwright
+            # Start the Playwright driver outside a with-block so it outlives this call
+            playwright = sync_playwright().start()
+            # Launch Chromium browser in headless mode (no GUI)
+            browser = playwright.chromium.launch(headless=True)
+        # On failure, fetch() will try Playwright per page and fall back to requests
+        except Exception as e:
+            print(f"Playwright failed to launch a browser: {e}")
+    try:
+        # Hand the browser (or None) to the crawl
+        yield browser
+    finally:
+        # Closing the browser also closes every context and page created in it
+        if browser:
+            browser.close()
+        # Stop the Playwright driver process
+        if playwright:
+            playwright.stop()
+
+
+def _block_heavy_resources(route):
+    """
+    Playwright route handler that aborts resource types the scraper never reads.
+    
+    Args:
+        route (object): Playwright Route for an outgoing request
+    """
+    # Drop images, fonts and media; let documents, scripts, XHR etc. through
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def new_browser_context(browser, cookies=None, storage_state=None):
+    """
+    Create a Playwright browser context, optionally seeded with an authenticated session.
+    
+    Args:
+        browser (object): Playwright Browser to create the context in
+        cookies (list): Cookie dictionaries to add to the context
+        storage_state (dict): Saved storage state (cookies + local storage) to restore
+        
+    Returns:
+        object: The new Playwright BrowserContext
+    """
+    # Create the context, restoring any saved session state
+    context = browser.new_context(storage_state=storage_state)
+    # Abort requests for images, fonts and media; only the HTML is needed
+    context.route("**/*", _block_heavy_resources)
+    # If cookies were provided, add them to the context for authentication
+    if cookies:
+        context.add_cookies(cookies)
+    # Return the ready-to-use context
+    return context
+
+
+def recycle_context(context):
+    """
+    Replace a long-lived browser context with a fresh one that keeps its session.
+    
+    Playwright contexts grow in memory over many page loads; closing and
+    recreating them periodically bounds that growth without losing login state.
+    
+    Args:
+        context (object): Playwright BrowserContext to replace
+        
+    Returns:
+        object: New BrowserContext carrying the old context's cookies and storage
+    """
+    # Snapshot cookies and local storage so authentication survives the swap
+    state = context.storage_state()
+    # Remember which browser owns the context before closing it
+    browser = context.browser
+    # Close the old context, freeing its accumulated memory
+    context.close()
+    # Create the replacement context from the saved state
+    return new_browser_context(browser, storage_state=state)
+
+
+def render_page(context, url, wait_selector=WAIT_SELECTOR):
+    """
+    Load a URL in a Playwright context and return the rendered HTML.
+    
+    Args:
+        context (object): Playwright BrowserContext to open the page in
+        url (str): URL to load
+        wait_selector (str): CSS selector for the content to wait for (empty to skip waiting)
+        
+    Returns:
+        str: HTML content of the rendered page
+    """
+    # Create a new page within the context
+    page = context.new_page()
+    try:
+        # Navigate to the URL and wait only for the DOM to be parsed, not for network silence
+        page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        # Give client-side rendering a moment to produce the main content container
+        if wait_selector:
+            try:
+                page.wait_for_selector(wait_selector, timeout=5000)
+            # Pages without a recognised container are still captured as-is
+            except Exception:
+                pass
+        # Extract the rendered HTML after JavaScript execution
+        return page.content()
+    finally:
+        # Close the page (the context remains open for reuse)
+        page.close()
+
+
+@contextmanager
+def crawl_session(cookies=None):
+    """
+    Scope the shared HTTP session's cookies to a single crawl.
+    
+    The given cookies (and any the server sets during the crawl) are sent only
+    until the block exits; the session's previous cookies are then restored and
+    its pooled connections closed.
+    
+    Args:
+        cookies (list): Cookie dictionaries to send with plain HTTP requests
+    """
+    # Remember the cookies the session had before the crawl
+    saved = SESSION.cookies.copy()
+    # Send any authentication cookies with plain HTTP requests as well as Playwright
+    if cookies:
+        load_session_cookies(cookies)
+    try:
+        # Run the crawl
+        yield
+    finally:
+        # Drop the crawl's cookies so later fetches don't keep authenticating
+        SESSION.cookies = saved
+        # Release the pooled connections now that the crawl is finished
+        close()
+
+
+def fetch_rendered(url, cookies=None, context=None, wait_selector=WAIT_SELECTOR):
+    """
+    Fetch a page with Playwright, without falling back to plain HTTP on failure.
+    
+    Args:
+        url (str): URL to fetch
+        cookies (list): List of cookie dictionaries to inject when no context is given
+        context (object): Playwright browser context with existing authenticated session
+        wait_selector (str): CSS selector Playwright waits for after the DOM loads
+        
+    Returns:
+        str: HTML content of the rendered page
+        
+    Raises:
+        Exception: Any Playwright error, or RuntimeError if no browser could be launched
+    """
+    # If a browser context with existing cookies/session is provided, reuse it
+    if context:
+        # Render the page in the existing context
+        return render_page(context, url, wait_selector)
+    # No context provided, launch a browser just for this page
+    with launch_browser() as browser:
+        # Surface launch failures so callers can fall back
+        if browser is None:
+            raise RuntimeError("could not launch browser")
+        # Render the page in a fresh context carrying any cookies
+        return render_page(new_browser_context(browser, cookies=cookies), url, wait_selector)
+
+
+def fetch(url, use_playwright=False, cookies=None, context=None, wait_selector=WAIT_SELECTOR, cache_dir=None, cache_max_age=CACHE_MAX_AGE):
     """
     Fetch HTML content from a URL, with optional JavaScript rendering via Playwright.
     
@@ -139,48 +569,22 @@ def fetch(url, use_playwright=False, cookies=None, context=None):
         use_playwright (bool): Whether to use Playwright for JavaScript rendering
         cookies (list): List of cookie dictionaries to inject into the request
         context (object): Playwright browser context with existing authenticated session
+        wait_selector (str): CSS selector Playwright waits for after the DOM loads
+        cache_dir (str): Directory for the on-disk page cache (None disables caching)
+        cache_max_age (float): Seconds a cached page is used without revalidation
         
     Returns:
         str: HTML content of the page
     """
+    # Route through the on-disk cache when one is configured
+    if cache_dir:
+        return fetch_cached(url, cache_dir, cache_max_age, use_playwright, cookies, context, wait_selector)
+    
     # Check if Playwright-based fetching with JS rendering is requested
     if use_playwright:
         try:
-            # Import Playwright's synchronous API
-            from playwright.sync_api import sync_playwright
-            
-            # If a browser context with existing cookies/session is provided, reuse it
-            if context:
-                # Create a new page within the existing context
-                page = context.new_page()
-                # Navigate to the URL and wait until network is idle (JS complete)
-                page.goto(url, wait_until="networkidle", timeout=30000)
-                # Extract the fully rendered HTML after JavaScript execution
-                html = page.content()
-                # Close the page (context remains open for reuse)
-                page.close()
-                # Return the fetched HTML
-                return html
-            else:
-                # No context provided, create a fresh Playwright instance
-                with sync_playwright() as p:
-                    # Launch Chromium browser in headless mode (no GUI)
-                    browser = p.chromium.launch(headless=True)
-                    # Create a new browser context
-                    browser_context = browser.new_context()
-                    # If cookies were provided, add them to the context for authentication
-                    if cookies:
-                        browser_context.add_cookies(cookies)
-                    # Create a new page within the browser context
-                    page = browser_context.new_page()
-                    # Navigate to the URL with networkidle wait condition for JS completion
-                    page.goto(url, wait_until="networkidle", timeout=30000)
-                    # Extract the fully rendered HTML content
-                    html = page.content()
-                    # Close the browser (context and page close automatically)
-                    browser.close()
-                    # Return the HTML content
-                    return html
+            # Render the page with JavaScript executed
+            return fetch_rendered(url, cookies, context, wait_selector)
         # Catch any Playwright-related errors and fallback to requests library
         except Exception as e:
             # Log the error message to inform user of fallback behavior
@@ -194,7 +598,7 @@ def fetch(url, use_playwright=False, cookies=None, context=None):
 
 def fetch_requests(url):
     """
-    Fetch HTML content from a URL using the requests library.
+    Fetch HTML content from a URL using the shared requests session.
     
     Args:
         url (str): URL to fetch
@@ -204,132 +608,578 @@ def fetch_requests(url):
         
     Raises:
         requests.HTTPError: If the HTTP request returns an error status code
+        ValueError: If the response is not HTML or exceeds MAX_PAGE_BYTES
     """
-    # Send a GET request to the URL with custom headers and a timeout
-    r = requests.get(url, headers=HEADERS, timeout=15)
-    # Raise an HTTPError exception if the response status indicates an error
-    r.raise_for_status()
-    # Return the response text content (the HTML)
-    return r.text
+    # Fetch unconditionally and keep only the HTML
+    return fetch_requests_conditional(url)[0]
 
 
-def crawl(start_url, max_pages=200, delay=0.5, path_prefix=None, use_playwright=False, cookies=None, context=None):
+def fetch_requests_conditional(url, validators=None):
     """
-    Crawl a website starting from a URL, extracting and storing page content.
+    Fetch HTML content from a URL, optionally as a conditional request.
+    
+    The body is streamed so non-HTML responses and oversized pages are rejected
+    before they are read into memory.
     
     Args:
-        start_url (str): URL to begin crawling from
-        max_pages (int): Maximum number of pages to crawl
-        delay (float): Delay in seconds between requests (for politeness)
-        path_prefix (str): Only crawl URLs matching this path prefix
-        use_playwright (bool): Whether to use Playwright for JavaScript rendering
-        cookies (list): Cookie dictionaries to use for authenticated requests
-        context (object): Playwright browser context for reusing authenticated session
+        url (str): URL to fetch
+        validators (dict): Previously seen ETag / Last-Modified values to revalidate against
         
     Returns:
-        list: List of dictionaries with keys: url, title, html
+        tuple: (html, validators) where html is None if the server answered 304 Not Modified,
+            and validators holds the response's ETag / Last-Modified values
+        
+    Raises:
+        requests.HTTPError: If the HTTP request returns an error status code
+        ValueError: If the response is not HTML or exceeds MAX_PAGE_BYTES
     """
-    # Initialize a set to track URLs we've already visited (prevents duplicates)
-    seen = set()
-    # Initialize a queue (list) of URLs to visit, starting with the entry point
-    to_visit = [start_url]
-    # Initialize a list to accumulate successfully fetched and processed pages
-    pages = []
+    # Start from the standard headers and add conditional headers for cached validators
+    headers = dict(HEADERS)
+    if validators and validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators and validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    
+    # Hold off if the server said its rate limit is exhausted
+    wait_for_rate_limit()
     
-    # Continue the crawl while there are URLs to visit AND we haven't reached max_pages
-    while to_visit and len(pages) < max_pages:
-        # Pop the first URL from the queue (FIFO - breadth-first crawling)
-        url = to_visit.pop(0)
+    # Send a streaming GET request over the pooled session with custom headers and a timeout
+    with SESSION.get(url, headers=headers, timeout=15, stream=True) as r:
+        # Record any rate-limit exhaustion so later requests back off
+        note_rate_limit(r.headers)
+        # The cached copy is still current; nothing to download
+        if r.status_code == 304:
+            return None, validators
+        # Raise an HTTPError exception if the response status indicates an error
+        r.raise_for_status()
         
-        # Skip this URL if we've already visited and processed it
-        if url in seen:
-            continue
+        # Skip binaries (PDFs, images, archives) without downloading them
+        content_type = r.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in HTML_CONTENT_TYPES:
+            raise ValueError(f"not HTML (Content-Type: {content_type})")
         
-        # Skip this URL if it's on a different domain than the starting URL
-        if not same_domain(start_url, url):
-            continue
+        # Reject pages whose declared size is already over the limit
+        length = r.headers.get("Content-Length", "")
+        if length.isdigit() and int(length) > MAX_PAGE_BYTES:
+            raise ValueError(f"page too large ({length} bytes)")
         
-        # Skip this URL if a path prefix filter is active and this URL doesn't match it
-        if path_prefix and not is_within_prefix(url, path_prefix):
-            continue
+        # Read the body in chunks, enforcing the limit even without a Content-Length header
+        body = bytearray()
+        for chunk in r.iter_content(chunk_size=64 * 1024):
+            body.extend(chunk)
+            if len(body) > MAX_PAGE_BYTES:
+                raise ValueError(f"page too large (over {MAX_PAGE_BYTES} bytes)")
         
-        # Attempt to fetch the webpage at this URL
-        try:
-            # Print progress message showing the current URL being fetched
-            print(f"Fetching: {url}")
-            # Fetch the HTML content using the configured fetch method
-            html = fetch(url, use_playwright=use_playwright, cookies=cookies, context=context)
-        # Catch any exception that occurs during fetching
-        except Exception as e:
-            # Print error message with URL and exception details for debugging
-            print(f"Failed {url}: {e}")
-            # Mark this URL as seen even though it failed (don't retry)
-            seen.add(url)
-            # Continue to process the next URL in the queue
-            continue
+        # Remember the validators the server sent so the next run can revalidate
+        new_validators = {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
+        # Decode the HTML the same way response.text would
+        return decode_body(bytes(body), r.encoding), new_validators
+
+
+def decode_body(body, encoding=None):
+    """
+    Decode a response body the way requests' Response.text does.
+    
+    Args:
+        body (bytes): Raw response body
+        encoding (str): Charset from the response headers, or None if not declared
+        
+    Returns:
+        str: Decoded text
+    """
+    # No declared charset: guess it from the content, as Response.apparent_encoding does
+    if encoding is None and chardet is not None:
+        encoding = chardet.detect(body)["encoding"]
+    try:
+        # Decode with the declared (or detected) charset, replacing invalid bytes
+        return str(body, encoding or "utf-8", errors="replace")
+    # Unknown charset names (e.g. "charset=foo-bogus") fall back to UTF-8
+    except (LookupError, TypeError):
+        return str(body, "utf-8", errors="replace")
+
+
+def note_rate_limit(headers):
+    """
+    Pause future requests when the server reports that no requests remain in its window.
+    
+    Reads the common X-RateLimit-Remaining / X-RateLimit-Reset headers. The reset
+    value may be either seconds to wait or a Unix timestamp.
+    
+    Args:
+        headers (dict): Response headers
+    """
+    # Global so every fetch thread sees the same pause
+    global _rate_limited_until
+    # Only act once the server says the budget is used up and when it refills
+    try:
+        remaining = float(headers.get("X-RateLimit-Remaining", ""))
+        reset = float(headers.get("X-RateLimit-Reset", ""))
+    # Headers missing or not numeric: nothing to go on
+    except ValueError:
+        return
+    if remaining > 0:
+        return
+    # Large values are absolute timestamps, small ones are a number of seconds
+    wait = reset - time.time() if reset > 1e9 else reset
+    # Never pause for longer than MAX_RATE_LIMIT_WAIT
+    wait = min(max(wait, 0), MAX_RATE_LIMIT_WAIT)
+    # Push the shared "not before" time out (never pull it in)
+    with _rate_limit_lock:
+        _rate_limited_until = max(_rate_limited_until, time.time() + wait)
+
+
+def wait_for_rate_limit():
+    """
+    Sleep until any pause requested by the server's rate-limit headers has passed.
+    """
+    # Work out how much of the pause is left
+    with _rate_limit_lock:
+        remaining = _rate_limited_until - time.time()
+    # Sleep outside the lock so other threads can check it too
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+def cache_paths(cache_dir, url, rendered=False):
+    """
+    Build the cache file paths for a URL.
+    
+    Args:
+        cache_dir (str): Cache directory
+        url (str): URL being cached
+        rendered (bool): Whether the page was rendered with Playwright
+        
+    Returns:
+        tuple: (html_path, meta_path) named after the SHA-256 of the fetch mode and URL
+    """
+    # Rendered and plain-HTTP copies of a page differ (e.g. a JS shell), so key them apart
+    mode = "playwright" if rendered else "http"
+    # Hash the mode and URL so any URL maps to a safe, fixed-length file name
+    key = hashlib.sha256(f"{mode} {url}".encode("utf-8")).hexdigest()
+    # HTML body and validator metadata live side by side
+    return os.path.join(cache_dir, f"{key}.html"), os.path.join(cache_dir, f"{key}.json")
+
+
+def read_cache(cache_dir, url, rendered=False):
+    """
+    Load a cached page, if there is one.
+    
+    Args:
+        cache_dir (str): Cache directory
+        url (str): URL to look up
+        rendered (bool): Whether to look up the Playwright-rendered copy
         
-        # Mark this URL as visited since we successfully processed it
-        seen.add(url)
+    Returns:
+        tuple: (html, validators, age_seconds), or (None, None, None) on a cache miss
+    """
+    # Locate the cache files for this URL
+    html_path, meta_path = cache_paths(cache_dir, url, rendered)
+    try:
+        # Read the cached HTML and note how long ago it was stored or revalidated
+        with open(html_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        age = time.time() - os.path.getmtime(html_path)
+    # Nothing cached for this URL yet
+    except FileNotFoundError:
+        return None, None, None
+    try:
+        # Load the ETag / Last-Modified validators saved with the page
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            validators = json.load(f)
+    # Missing or unreadable metadata just means the page can't be revalidated
+    except (OSError, ValueError):
+        validators = {}
+    # Return the cached page with its validators and age
+    return html, validators, age
+
+
+def write_cache(cache_dir, url, html, validators=None, rendered=False):
+    """
+    Store a fetched page in the cache, replacing any previous copy atomically.
+    
+    Args:
+        cache_dir (str): Cache directory
+        url (str): URL that was fetched
+        html (str): HTML content of the page
+        validators (dict): ETag / Last-Modified values from the response
+        rendered (bool): Whether the page was rendered with Playwright
+    """
+    # Create the cache directory on first use
+    os.makedirs(cache_dir, exist_ok=True)
+    # Locate the cache files for this URL
+    html_path, meta_path = cache_paths(cache_dir, url, rendered)
+    # Write the body before its validators: if interrupted in between, old validators next to
+    # a new body only cause a refetch, whereas new validators would vouch for a stale body
+    for path, content in ((html_path, html), (meta_path, json.dumps(validators or {}))):
+        # Write to a temporary name first so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            # Atomically move the finished file into place
+            os.replace(tmp_path, path)
+        # Don't leave half-written temporary files behind
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def fetch_cached(url, cache_dir, max_age=CACHE_MAX_AGE, use_playwright=False, cookies=None, context=None, wait_selector=WAIT_SELECTOR):
+    """
+    Fetch a page through the on-disk cache.
+    
+    Plain-HTTP and Playwright-rendered copies of a page are cached separately.
+    Fresh cache entries are returned without touching the network. Stale entries
+    fetched over plain HTTP are revalidated with If-None-Match / If-Modified-Since.
+    
+    Args:
+        url (str): URL to fetch
+        cache_dir (str): Cache directory
+        max_age (float): Seconds a cached page is used without revalidation
+        use_playwright (bool): Whether to use Playwright for JavaScript rendering
+        cookies (list): List of cookie dictionaries to inject into the request
+        context (object): Playwright browser context with existing authenticated session
+        wait_selector (str): CSS selector Playwright waits for after the DOM loads
         
-        # Extract the main article/content area from the full HTML
-        main = extract_main_content(html)
+    Returns:
+        str: HTML content of the page
+    """
+    # Look for a previous copy of this page
+    cached, validators, age = read_cache(cache_dir, url, use_playwright)
+    # Serve fresh entries straight from disk
+    if cached is not None and age < max_age:
+        return cached
+    
+    # Rendered pages have no HTTP validators, so Playwright always refetches
+    if use_playwright:
+        try:
+            html = fetch_rendered(url, cookies, context, wait_selector)
+        # On failure fall back to plain HTTP, cached under the plain-HTTP key so the
+        # unrendered page is never served as a rendered one
+        except Exception as e:
+            print(f"Playwright failed, falling back to requests: {e}")
+            return fetch_cached(url, cache_dir, max_age)
+        validators = {}
+    else:
+        # Ask the server whether the cached copy (if any) is still current
+        html, validators = fetch_requests_conditional(url, validators)
+        # Not modified: mark the cached copy fresh again and reuse it
+        if html is None:
+            os.utime(cache_paths(cache_dir, url)[0])
+            return cached
+    
+    # Store the new copy for future runs
+    write_cache(cache_dir, url, html, validators, use_playwright)
+    # Return the freshly fetched HTML
+    return html
+
+
+def fetch_page(url, use_playwright=False, cookies=None, context=None, wait_selector=WAIT_SELECTOR, cache_dir=None, cache_max_age=CACHE_MAX_AGE):
+    """
+    Fetch a single page for the crawler, capturing errors instead of raising them.
+    
+    Args:
+        url (str): URL to fetch
+        use_playwright (bool): Whether to use Playwright for JavaScript rendering
+        cookies (list): Cookie dictionaries to use for authenticated requests
+        context (object): Playwright browser context for reusing authenticated session
+        wait_selector (str): CSS selector Playwright waits for after the DOM loads
+        cache_dir (str): Directory for the on-disk page cache (None disables caching)
+        cache_max_age (float): Seconds a cached page is used without revalidation
         
-        # Parse the HTML to extract the page's title element
-        title = BeautifulSoup(html, "html.parser").title
-        # Get the text content from the title tag, or fallback to the URL if missing
-        title_text = title.get_text().strip() if title else url
+    Returns:
+        tuple: (url, html, error, from_cache) where exactly one of html and error is None,
+            and from_cache is True if the page was served from the cache without a request
+    """
+    # Attempt to fetch the webpage at this URL
+    try:
+        # Serve fresh cache entries here so the crawler knows no request was made
+        if cache_dir:
+            cached, _, age = read_cache(cache_dir, url, use_playwright)
+            if cached is not None and age < cache_max_age:
+                # Print progress message showing the page came from the cache
+                print(f"Cached: {url}")
+                return url, cached, None, True
+        # Print progress message showing the current URL being fetched
+        print(f"Fetching: {url}")
+        # Fetch the HTML content using the configured fetch method
+        return url, fetch(url, use_playwright=use_playwright, cookies=cookies, context=context, wait_selector=wait_selector, cache_dir=cache_dir, cache_max_age=cache_max_age), None, False
+    # Catch any exception so one bad URL doesn't abort the rest of the batch
+    except Exception as e:
+        # Hand the error back to the crawler for reporting
+        return url, None, e, False
+
+
+def adaptive_delay(rtt, delay_min=0.5, delay_max=5.0, jitter=0.2):
+    """
+    Work out how long to pause after a request, based on how long it took.
+    
+    Fast servers get the minimum delay; slow (possibly overloaded) servers get
+    proportionally longer pauses. Random jitter avoids a fixed request rhythm.
+    
+    Args:
+        rtt (float): Seconds the last request (or batch) took
+        delay_min (float): Shortest pause in seconds
+        delay_max (float): Longest pause in seconds, before jitter
+        jitter (float): Upper bound of a random extra pause in seconds
         
-        # Create a dictionary entry for this page with its metadata and content
-        pages.append({"url": url, "title": title_text, "html": main})
+    Returns:
+        float: Seconds to sleep
+    """
+    # Scale the response time, clamp it to the configured range, then add jitter
+    return max(delay_min, min(delay_max, rtt * DELAY_RTT_FACTOR)) + random.uniform(0, jitter)
+
+
+def iter_crawl(start_url, max_pages=200, delay=0.5, path_prefix=None, use_playwright=False, cookies=None, context=None, workers=4, recycle_every=25, wait_selector=WAIT_SELECTOR, cache_dir=None, cache_max_age=CACHE_MAX_AGE, delay_max=5.0, jitter=0.2):
+    """
+    Crawl a website starting from a URL, yielding each page's content as it is processed.
+    
+    Yielding pages instead of collecting them lets callers write each page out
+    and drop it, so memory use doesn't grow with the size of the crawl.
+    
+    Pages are fetched in batches of up to ``workers`` concurrent requests. Playwright
+    fetches always run one at a time because its synchronous API is not thread-safe.
+    The pause after each batch scales with how long the server took to respond
+    (see adaptive_delay), so slow servers are given more breathing room.
+    
+    When Playwright is used without a ``context``, the crawl launches one shared
+    browser and recycles its context every ``recycle_every`` pages to bound memory.
+    A caller-supplied context is used as-is and never closed.
+    
+    Args:
+        start_url (str): URL to begin crawling from
+        max_pages (int): Maximum number of pages to crawl
+        delay (float): Minimum delay in seconds between batches of requests (for politeness)
+        path_prefix (str): Only crawl URLs matching this path prefix
+        use_playwright (bool): Whether to use Playwright for JavaScript rendering
+        cookies (list): Cookie dictionaries to use for authenticated requests
+        context (object): Playwright browser context for reusing authenticated session
+        workers (int): Maximum number of pages to fetch concurrently
+        recycle_every (int): Pages between browser context recycles (0 disables recycling)
+        wait_selector (str): CSS selector Playwright waits for after the DOM loads
+        cache_dir (str): Directory for the on-disk page cache (None disables caching)
+        cache_max_age (float): Seconds a cached page is used without revalidation
+        delay_max (float): Maximum delay in seconds between batches of requests
+        jitter (float): Upper bound of a random extra delay added to each pause
         
-        # Extract all hyperlinks from the current page's HTML
-        links = get_links(html, url)
+    Yields:
+        dict: Page dictionary with keys: url, title, html
+    """
+    # Initialize a FIFO queue of URLs to visit, starting with the entry point
+    to_visit = deque([start_url])
+    # Track every URL ever queued so each one is fetched at most once
+    enqueued = {start_url}
+    # Count successfully fetched and processed pages
+    count = 0
+    # Parse the start URL and path prefix once instead of for every candidate link
+    start_netloc = _parse_url(start_url).netloc
+    prefix_path = _parse_url(path_prefix).path if path_prefix else None
+    # Force serial fetching for Playwright, otherwise allow at least one worker
+    workers = 1 if use_playwright else max(1, workers)
+    
+    # Scope the shared HTTP session (and its authentication cookies) to this crawl, then create a
+    # thread pool for concurrent fetching (threads are only started when used), plus a shared
+    # browser when rendering with Playwright and no context was supplied
+    with crawl_session(cookies), ThreadPoolExecutor(max_workers=workers) as pool, \
+            launch_browser(use_playwright and context is None) as browser:
+        # Give the crawl's own browser a context carrying the authentication cookies
+        if browser:
+            context = new_browser_context(browser, cookies=cookies)
+        # Count pages rendered in the current context since it was last recycled
+        pages_since_recycle = 0
         
-        # Process each extracted link for potential future crawling
-        for l in links:
-            # Add link to the crawl queue if it hasn't been seen and meets criteria
-            if l not in seen and l not in to_visit and same_domain(start_url, l):
-                # Also check if the link matches the path prefix (if one is specified)
-                if not path_prefix or is_within_prefix(l, path_prefix):
-                    # Add the link to the end of the queue for future processing
-                    to_visit.append(l)
+        # Continue the crawl while there are URLs to visit AND we haven't reached max_pages
+        while to_visit and count < max_pages:
+            # Collect the next batch of URLs, never more than the pages still allowed
+            batch = []
+            while to_visit and len(batch) < min(workers, max_pages - count):
+                # Pop the first URL from the queue (FIFO - breadth-first crawling)
+                url = to_visit.popleft()
+                
+                # Skip this URL if it's on a different domain than the starting URL
+                if _parse_url(url).netloc != start_netloc:
+                    continue
+                
+                # Skip this URL if a path prefix filter is active and this URL doesn't match it
+                if prefix_path and not _parse_url(url).path.startswith(prefix_path):
+                    continue
+                
+                # Add the URL to the batch to be fetched
+                batch.append(url)
+            
+            # Stop if the queue held nothing left to fetch
+            if not batch:
+                break
+            
+            # Fetch the batch concurrently, or inline when only one worker is allowed
+            mapper = pool.map if workers > 1 else map
+            # Time the batch so the politeness delay can follow the server's response time
+            started = time.perf_counter()
+            # Results come back in batch order so the crawl stays breadth-first
+            results = list(mapper(lambda u: fetch_page(u, use_playwright, cookies, context, wait_selector, cache_dir, cache_max_age), batch))
+            # The batch takes as long as its slowest response
+            rtt = time.perf_counter() - started
+            
+            # Process each fetched page in the order it was queued
+            for url, html, error, _ in results:
+                # Report failures and move on to the next page in the batch
+                if error is not None:
+                    # Print error message with URL and exception details for debugging
+                    print(f"Failed {url}: {error}")
+                    continue
+                
+                # Parse the HTML once; the title, main content and links all reuse this soup
+                soup = BeautifulSoup(html, "lxml")
+                
+                # Extract all hyperlinks first; content extraction prunes <nav> and other link-heavy elements
+                links = get_links_from_soup(soup, url)
+                
+                # Extract the main article/content area from the parsed page
+                main = extract_main_content_from_soup(soup)
+                
+                # Get the page's title element from the parsed page
+                title = soup.title
+                # Get the text content from the title tag, or fallback to the URL if missing
+                title_text = title.get_text().strip() if title else url
+                
+                # Hand this page's metadata and content to the caller
+                count += 1
+                yield {"url": url, "title": title_text, "html": main}
+                
+                # Process each extracted link for potential future crawling
+                for l in links:
+                    # Skip links that were already queued (including ones already fetched or failed)
+                    if l in enqueued:
+                        continue
+                    # Queue the link if it's on the same domain and within the path prefix (if any)
+                    if _parse_url(l).netloc == start_netloc and (not prefix_path or _parse_url(l).path.startswith(prefix_path)):
+                        # Remember the link so it is never queued twice
+                        enqueued.add(l)
+                        # Add the link to the end of the queue for future processing
+                        to_visit.append(l)
+            
+            # Periodically swap the crawl's own browser context for a fresh one
+            if browser and recycle_every:
+                pages_since_recycle += len(batch)
+                if pages_since_recycle >= recycle_every:
+                    context = recycle_context(context)
+                    pages_since_recycle = 0
+            
+            # Sleep in proportion to the server's response time to be respectful to its resources,
+            # unless the whole batch was served from the cache and the server was never contacted
+            if not all(from_cache for *_, from_cache in results):
+                time.sleep(adaptive_delay(rtt, delay, delay_max, jitter))
+
+
+def crawl(start_url, max_pages=200, delay=0.5, path_prefix=None, use_playwright=False, cookies=None, context=None, workers=4, recycle_every=25, wait_selector=WAIT_SELECTOR, cache_dir=None, cache_max_age=CACHE_MAX_AGE, delay_max=5.0, jitter=0.2):
+    """
+    Crawl a website starting from a URL, collecting every page in memory.
+    
+    Args:
+        Same as iter_crawl.
         
-        # Sleep for the specified delay to be respectful to the server's resources
-        time.sleep(delay)
+    Returns:
+        list: List of dictionaries with keys: url, title, html
+    """
+    # Run the crawl to completion and return all pages at once
+    return list(iter_crawl(start_url, max_pages, delay, path_prefix, use_playwright, cookies, context, workers, recycle_every, wait_selector, cache_dir, cache_max_age, delay_max, jitter))
+
+
+def close():
+    """
+    Close all pooled connections held by the shared HTTP session.
+    
+    The session remains usable afterwards; new connections are opened on demand.
+    """
+    # Close the session's adapters, dropping any idle keep-alive connections
+    SESSION.close()
+
+
+def page_to_markdown(page):
+    """
+    Convert a single fetched page to a Markdown section.
+    
+    Kept at module level so it can be sent to worker processes.
     
-    # Return the complete list of successfully fetched and processed pages
-    return pages
+    Args:
+        page (dict): Page dictionary with url, title, and html keys
+        
+    Returns:
+        str: Markdown for the page, headed by its title and source URL
+    """
+    # Create a header section with the page title and source URL as metadata
+    header = f"# {page['title']}\n\nSource: {page['url']}\n\n"
+    # Parse the extracted HTML with the C-backed lxml parser; markdownify's md() helper
+    # would reparse it with the much slower pure-Python html.parser
+    soup = BeautifulSoup(page['html'], "lxml")
+    # Walk the parsed tree directly to produce Markdown
+    return header + MARKDOWN.convert_soup(soup)
 
 
-def save_pages(pages, out_path):
+def save_pages(pages, out_path, processes=None):
     """
     Convert fetched pages to Markdown format and save to a file.
     
+    Pages are converted in parallel worker processes since markdownify is CPU-bound,
+    and each page is written as soon as it is ready. ``pages`` may be a generator such
+    as iter_crawl(), in which case only a few pages are held in memory at a time.
+    
     Args:
-        pages (list): List of page dictionaries with url, title, and html keys
+        pages (iterable): Page dictionaries with url, title, and html keys
         out_path (str): File path where the combined Markdown should be saved
+        processes (int): Number of worker processes (defaults to the CPU count)
+        
+    Returns:
+        int: Number of pages written
     """
-    # Initialize a list to hold individual page Markdown documents before combining
-    combined = []
-    
     # Create the output directory and any parent directories if they don't exist
     os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    # Limit conversions in flight so a streaming crawl isn't buffered in full
+    window = 2 * (processes or os.cpu_count() or 1)
+    # Count pages written so separators go between pages only
+    written = 0
     
-    # Iterate through each page to convert and format it
-    for p in pages:
-        # Convert the HTML content to Markdown format using ATX-style headings
-        md_text = md(p['html'], heading_style="ATX")
+    # Open the output file for writing in text mode with UTF-8 character encoding, and
+    # start worker processes with "spawn" since the crawl may still be running threads
+    with open(out_path, 'w', encoding='utf-8') as f, \
+            ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn")) as ex:
+        # Queue of pending conversions, oldest first, so output keeps the crawl order
+        pending = deque()
         
-        # Create a header section with the page title and source URL as metadata
-        header = f"# {p['title']}\n\nSource: {p['url']}\n\n"
+        # Submit each page for conversion as it arrives
+        for p in pages:
+            pending.append(ex.submit(page_to_markdown, p))
+            # Once the window is full, write out the oldest finished page before taking more
+            while len(pending) >= window:
+                written = _write_page(f, pending.popleft().result(), written)
         
-        # Combine the header and Markdown content for this page
-        combined.append(header + md_text)
+        # Write out the conversions still in flight
+        while pending:
+            written = _write_page(f, pending.popleft().result(), written)
+    
+    # Return how many pages ended up in the file
+    return written
+
+
+def _write_page(f, text, written):
+    """
+    Append one page of Markdown to the output file, separated from the previous page.
     
-    # Open the output file for writing in text mode with UTF-8 character encoding
-    with open(out_path, 'w', encoding='utf-8') as f:
-        # Join all pages with a page break separator (---) and write to the file
-        f.write('\n\n---\n\n'.join(combined))
+    Args:
+        f (file): Open output file
+        text (str): Markdown for the page
+        written (int): Number of pages already written
+        
+    Returns:
+        int: Updated number of pages written
+    """
+    # Separate pages with a page break (---)
+    if written:
+        f.write('\n\n---\n\n')
+    # Write the page itself
+    f.write(text)
+    # Count the page
+    return written + 1
 
 
 # Entry point: execute this block only when script is run directly (not when imported)
@@ -342,12 +1192,26 @@ if __name__ == '__main__':
     ap.add_argument('--output', '-o', default='combined.md')
     # Define optional argument for maximum number of pages to crawl (defaults to 200)
     ap.add_argument('--max-pages', type=int, default=200)
-    # Define optional argument for delay between requests in seconds (defaults to 0.5)
-    ap.add_argument('--delay', type=float, default=0.5)
+    # Define optional argument for the minimum delay between requests in seconds (defaults to 0.5)
+    ap.add_argument('--delay', '--delay-min', dest='delay', type=float, default=0.5, help='Minimum delay between batches of requests')
+    # Define optional argument for the maximum delay between requests in seconds (defaults to 5)
+    ap.add_argument('--delay-max', type=float, default=5.0, help='Maximum delay between batches of requests')
+    # Define optional argument for random extra delay in seconds (defaults to 0.2)
+    ap.add_argument('--jitter', type=float, default=0.2, help='Upper bound of random extra delay added to each pause')
+    # Define optional argument for number of concurrent fetches (defaults to 4)
+    ap.add_argument('--workers', type=int, default=4, help='Number of pages to fetch concurrently')
     # Define optional argument for path prefix to restrict crawling scope
     ap.add_argument('--path-prefix', type=str, default=None)
     # Define flag to enable Playwright JavaScript rendering (default: disabled)
     ap.add_argument('--playwright', action='store_true', help='Use Playwright for JS rendering')
+    # Define optional argument for how often to recycle the Playwright browser context (defaults to 25)
+    ap.add_argument('--recycle-every', type=int, default=25, help='Recycle the Playwright browser context every N pages (0 to disable)')
+    # Define optional argument for the CSS selector Playwright waits for (empty string disables waiting)
+    ap.add_argument('--wait-selector', type=str, default=WAIT_SELECTOR, help='CSS selector Playwright waits for before capturing a page')
+    # Define optional argument for a directory to cache fetched pages in across runs
+    ap.add_argument('--cache-dir', type=str, default=None, help='Cache fetched HTML in this directory and reuse it on later runs')
+    # Define optional argument for how long cached pages stay fresh, in seconds (defaults to one day)
+    ap.add_argument('--cache-max-age', type=float, default=CACHE_MAX_AGE, help='Seconds a cached page is reused before revalidating it')
     # Define optional argument for path to JSON file containing authentication cookies
     ap.add_argument('--cookies', type=str, help='Load cookies from JSON file')
     # Parse the command-line arguments into an args object
@@ -362,18 +1226,16 @@ if __name__ == '__main__':
     
     # Check if a cookies file path was provided via command-line argument
     if args.cookies:
-        # Open the cookies JSON file for reading
-        with open(args.cookies, 'r') as f:
-            # Parse the JSON file and load the cookies list into memory
-            cookies = json.load(f)
+        # Parse the JSON file and load the cookies list into memory
+        cookies = load_cookies(args.cookies)
         # Print confirmation message with the number of loaded cookies
         print(f"Loaded {len(cookies)} cookies from {args.cookies}")
     
     # Execute the web crawling with all specified parameters
-    pages = crawl(args.start_url, args.max_pages, args.delay, args.path_prefix, use_playwright=args.playwright, cookies=cookies)
+    pages = iter_crawl(args.start_url, args.max_pages, args.delay, args.path_prefix, use_playwright=args.playwright, cookies=cookies, workers=args.workers, recycle_every=args.recycle_every, wait_selector=args.wait_selector, cache_dir=args.cache_dir, cache_max_age=args.cache_max_age, delay_max=args.delay_max, jitter=args.jitter)
     
-    # Save all collected pages as a combined Markdown document
-    save_pages(pages, args.output)
+    # Stream each crawled page into the combined Markdown document as it arrives
+    count = save_pages(pages, args.output)
     
     # Print completion message with the total number of pages successfully saved
-    print(f"Saved {len(pages)} pages to {args.output}")
+    print(f"Saved {count} pages to {args.output}")